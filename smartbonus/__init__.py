@@ -1,4 +1,5 @@
 from .app import SmartBonus, set_root_path
+from .utils import RejectedError
 from .models import Nomenclature, Client, ReceiptDiscount, NomenclatureItem, ReceiptResult, ReceiptConfirm, \
     RefundItem, ReceiptRefund, RefundItemResult, AnalyticObject, ReceiptItem, ExecutedModule, Tag, OrderStatus, \
-    OrderProduct, Order, StatusBody, ORDER_STATUSES
+    OrderProduct, Order, StatusBody, SyncItemResult, ORDER_STATUSES
@@ -1,8 +1,10 @@
 import requests
-from .utils import catch_error
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from heapq import heappush, heappop
+from .utils import catch_error, RejectedError
 from .models import Client, Nomenclature, ReceiptDiscount, ReceiptResult, ReceiptConfirm, RefundItemResult, \
-    ReceiptRefund, Tag, StatusBody, ORDER_STATUSES
-from typing import List
+    ReceiptRefund, Tag, StatusBody, SyncItemResult, ORDER_STATUSES
+from typing import List, Dict, Tuple, Callable
 
 
 class SmartBonus:
@@ -38,7 +40,7 @@ class SmartBonus:
                                    **self._get_params(elements=[nom.to_json() for nom in nomes]))
         if isinstance(response, str) and response.startswith('Sync success'):
             return response
-        raise ValueError(str(response))
+        raise RejectedError(str(response))
 
     @catch_error
     def discount_receipt(self, receipt: ReceiptDiscount, **_) -> ReceiptResult:
@@ -70,7 +72,7 @@ class SmartBonus:
                                    **self._get_params(elements=[dict(remote_id=r) for r in receipts]))
         if isinstance(response, str) and response.startswith('Delete success'):
             return response
-        raise ValueError(str(response))
+        raise RejectedError(str(response))
 
     @catch_error
     def refund_receipt(self, receipt: ReceiptRefund, **_) -> List[RefundItemResult]:
@@ -98,7 +100,7 @@ class SmartBonus:
                                    **self._get_params(elements=[r.to_json() for r in receipts]))
         if isinstance(response, str) and response.startswith('Sync success'):
             return response
-        raise ValueError(str(response))
+        raise RejectedError(str(response))
 
     @catch_error
     def sync_tags(self, tags: List[Tag], **_) -> str:
@@ -116,7 +118,49 @@ class SmartBonus:
         response = self._send_post('sync/tag', str, **self._get_params(elements=[r.to_json() for r in tags]))
         if isinstance(response, str) and response.startswith('Sync success'):
             return response
-        raise ValueError(str(response))
+        raise RejectedError(str(response))
+
+    @catch_error
+    def bulk_sync_nomenclatures(self, nomes: List[Nomenclature], workers: int = 4, **_) -> List[SyncItemResult]:
+        """
+        Sync catalog of any size: nomenclatures are sent by 500 in a request,
+        rejected request is split in halves and resent until bad nomenclatures are found
+        If probe nomenclatures of rejected request get the same error, sync stops
+        and unsent nomenclatures are reported with that error
+        :param nomes: list of nomenclatures
+        :param workers: max count of parallel requests
+        :return: result of every nomenclature in order of nomes
+        """
+
+        return self._bulk_sync(self.sync_nomenclatures, nomes, 500, workers)
+
+    @catch_error
+    def bulk_sync_receipts(self, receipts: List[ReceiptConfirm], workers: int = 4, **_) -> List[SyncItemResult]:
+        """
+        Sync receipts of any count: receipts are sent by 100 in a request,
+        rejected request is split in halves and resent until bad receipts are found
+        If probe receipts of rejected request get the same error, sync stops
+        and unsent receipts are reported with that error
+        :param receipts: list of receipts
+        :param workers: max count of parallel requests
+        :return: result of every receipt in order of receipts
+        """
+
+        return self._bulk_sync(self.sync_receipts, receipts, 100, workers)
+
+    @catch_error
+    def bulk_sync_tags(self, tags: List[Tag], workers: int = 4, **_) -> List[SyncItemResult]:
+        """
+        Sync tags of any count: tags are sent by 500 in a request,
+        rejected request is split in halves and resent until bad tags are found
+        If probe tags of rejected request get the same error, sync stops
+        and unsent tags are reported with that error
+        :param tags: list of tags
+        :param workers: max count of parallel requests
+        :return: result of every tag in order of tags
+        """
+
+        return self._bulk_sync(self.sync_tags, tags, 500, workers)
 
     @catch_error
     def config_order(self, order_url: str, status_url: str, token: str) -> object:
@@ -143,6 +187,75 @@ class SmartBonus:
 
         return self._send_post('order/status', None, **self._get_params(**body.to_json()))
 
+    @staticmethod
+    def _bulk_sync(sync: Callable, items: list, size: int, workers: int) -> List[SyncItemResult]:
+        if not isinstance(items, list) or not items:
+            raise ValueError('No element found')
+        if workers < 1:
+            raise ValueError('Count of workers must be greater than 0')
+
+        results: List[SyncItemResult] = [None] * len(items)
+        # rejected full request chunk -> its error, indexes of probe items and their errors
+        probes: Dict[int, Tuple[RejectedError, List[int], list]] = {}
+        systemic: RejectedError = None
+        # chunks are sent in order of items: halves of rejected chunk are resent before the rest of items
+        todo = [(i, i, min(i + size, len(items))) for i in range(0, len(items), size)]
+        pending = {}
+
+        def resolve(first: int, last: int, error: RejectedError = None):
+            for i in range(first, last):
+                results[i] = SyncItemResult(items[i], error is None, error)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                while pending or todo and not systemic:
+                    while todo and not systemic and len(pending) < workers:
+                        root, start, end = heappop(todo)
+                        pending[executor.submit(sync, items[start:end])] = root, start, end
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        root, start, end = pending.pop(future)
+                        try:
+                            future.result()
+                            error = None
+                        except RejectedError as e:
+                            error = e
+
+                        if error is None or end - start == 1 or systemic:
+                            resolve(start, end, error)
+                        elif start == root and end - start == size:
+                            # store, auth or server problem rejects any item: probe first, middle and last items
+                            indexes = sorted({start, (start + end) // 2, end - 1})
+                            probes[root] = error, indexes, []
+                            for i in indexes:
+                                heappush(todo, (root, i, i + 1))
+                        else:
+                            middle = (start + end) // 2
+                            heappush(todo, (root, start, middle))
+                            heappush(todo, (root, middle, end))
+
+                        if root not in probes or start not in probes[root][1] or end - start != 1:
+                            continue
+                        chunk_error, indexes, errors = probes[root]
+                        errors.append(error)
+                        if len(errors) < len(indexes):
+                            continue
+                        if all(e is not None and str(e) == str(chunk_error) for e in errors):
+                            systemic = chunk_error
+                            continue
+                        for first, last in zip([root] + [i + 1 for i in indexes], indexes + [root + size]):
+                            if first < last:
+                                heappush(todo, (root, first, last))
+            except Exception:
+                for f in pending:
+                    f.cancel()
+                raise
+
+        for i, result in enumerate(results):
+            if result is None:
+                results[i] = SyncItemResult(items[i], False, systemic)
+        return results
+
     def _send_post(self, path: str, obj: object, **params):
         body = requests.post(self.root_path + path, json=params).json()
         return self._decode_response(body, obj)
@@ -159,7 +272,7 @@ class SmartBonus:
     def _decode_response(body: object, obj: object):
         if isinstance(body, dict) and 'message' in body:
             if body.get('status') != 200:
-                raise ValueError(str(body['message']))
+                raise RejectedError(str(body['message']))
 
             if not callable(obj):
                 return body['message']
@@ -295,3 +295,15 @@ class StatusBody(_BaseModel):
         self.order_id = order_id
         self.status = status
         super().__init__()
+
+
+class SyncItemResult:
+    """ Item response of bulk sync: ok is false if smartbonus rejected that item, error contains reason """
+
+    def __init__(self, item: object, ok: bool, error: Exception = None):
+        self.item = item  # your nomenclature, tag or receipt
+        self.ok = ok  # item synced to smartbonus
+        self.error = error  # exception raised by smartbonus for that item
+
+    def __repr__(self):
+        return f'{self.item}: {self.ok}'
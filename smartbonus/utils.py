@@ -10,3 +10,7 @@ def catch_error(func):
             return value, True
         return func(*args, **kwargs)
     return wrapper
+
+
+class RejectedError(ValueError):
+    """ Smartbonus received request but rejected it: non 200 status or unexpected message in response """
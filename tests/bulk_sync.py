@@ -0,0 +1,162 @@
+from smartbonus import set_root_path, SmartBonus, Nomenclature, NomenclatureItem, ReceiptConfirm, Tag, \
+    SyncItemResult, RejectedError
+from threading import Lock
+from unittest import mock
+import requests
+import unittest
+
+
+class TestBulkSync(unittest.TestCase):
+    """ Bisection of rejected requests without smartbonus server """
+
+    def setUp(self):
+        self.lock = Lock()
+        self.requests = 0
+
+    def _fake_sync(self, bad: set, error: Exception = None, message: str = None):
+        def sync(chunk: list) -> str:
+            with self.lock:
+                self.requests += 1
+            if error:
+                raise error
+            rejected = [str(item) for item in chunk if item in bad]
+            if rejected:
+                raise RejectedError(message or 'Invalid items: ' + ', '.join(rejected))
+            return 'Sync success'
+        return sync
+
+    def test_success(self):
+        items = list(range(1200))
+        results = SmartBonus._bulk_sync(self._fake_sync(set()), items, 500, 4)
+
+        self.assertEqual([r.item for r in results], items)
+        self.assertTrue(all(r.ok and r.error is None for r in results))
+        self.assertEqual(self.requests, 3)
+
+    def test_isolate_rejected_items(self):
+        items, bad = list(range(2000)), {7, 1234, 1999}
+        results = SmartBonus._bulk_sync(self._fake_sync(bad), items, 500, 4)
+
+        self.assertEqual([r.item for r in results], items)
+        self.assertEqual({r.item for r in results if not r.ok}, bad)
+        for r in results:
+            if not r.ok:
+                self.assertIsInstance(r.error, RejectedError)
+                self.assertEqual(str(r.error), f'Invalid items: {r.item}')
+        self.assertLess(self.requests, 100)
+
+    def test_isolate_rejected_items_with_same_message(self):
+        items, bad = list(range(1000)), {3, 250, 251, 998}
+        results = SmartBonus._bulk_sync(self._fake_sync(bad, message='Invalid data'), items, 500, 4)
+
+        self.assertEqual({r.item for r in results if not r.ok}, bad)
+        self.assertTrue(all(str(r.error) == 'Invalid data' for r in results if not r.ok))
+
+    def test_small_chunk_all_rejected(self):
+        for items, bad in ((list(range(1002)), {1000, 1001}), ([0, 1], {0, 1})):
+            results = SmartBonus._bulk_sync(self._fake_sync(bad, message='Invalid data'), items, 500, 4)
+
+            self.assertEqual([r.item for r in results], items)
+            self.assertEqual({r.item for r in results if not r.ok}, bad)
+            self.assertTrue(all(str(r.error) == 'Invalid data' for r in results if not r.ok))
+
+    def test_systemic_rejection_stops(self):
+        sync = self._fake_sync(set(), RejectedError('Store not found'))
+        results = SmartBonus._bulk_sync(sync, list(range(10000)), 500, 4)
+
+        self.assertEqual(len(results), 10000)
+        self.assertTrue(all(not r.ok and str(r.error) == 'Store not found' for r in results))
+        self.assertLessEqual(self.requests, 12)
+
+    def test_systemic_rejection_keeps_synced_items(self):
+        def sync(chunk: list) -> str:
+            if chunk[0] >= 1000:
+                raise RejectedError('Store not found')
+            return 'Sync success'
+
+        results = SmartBonus._bulk_sync(sync, list(range(5000)), 500, 1)
+        self.assertTrue(all(r.ok for r in results[:1000]))
+        self.assertTrue(all(not r.ok and str(r.error) == 'Store not found' for r in results[1000:]))
+
+    def test_failure_propagates(self):
+        for error in (requests.ConnectionError('Connection refused'), ValueError('Expecting value'),
+                      AttributeError('<html>502 Bad Gateway</html>')):
+            self.requests = 0
+            self.assertRaises(type(error), SmartBonus._bulk_sync, self._fake_sync(set(), error),
+                              list(range(1000)), 500, 2)
+            self.assertLessEqual(self.requests, 2)
+
+    def test_decode_response(self):
+        self.assertRaises(RejectedError, SmartBonus._decode_response, {'status': 400, 'message': 'bad'}, str)
+        self.assertRaises(AttributeError, SmartBonus._decode_response, '<html>503</html>', str)
+
+
+class TestBulkSyncMethods(unittest.TestCase):
+    """ Public bulk sync methods with mocked smartbonus server """
+
+    def setUp(self):
+        set_root_path('https://smartbonus.test/api/v2/')
+        self.sb = SmartBonus('store')
+        self.lock = Lock()
+        self.posts = []
+
+    def _fake_post(self, bad: set):
+        def post(url: str, json: dict):
+            with self.lock:
+                self.posts.append((url, json))
+            ids = [e.get('id') or e.get('remote_id') for e in json['elements']]
+            response = mock.Mock()
+            if bad.intersection(ids):
+                response.json.return_value = dict(status=400, message='Invalid data')
+            else:
+                response.json.return_value = dict(status=200, message='Sync success')
+            return response
+        return post
+
+    def _chunks(self, path: str) -> list:
+        self.assertTrue(all(url.endswith(path) and json['store'] == 'store' for url, json in self.posts))
+        return sorted(len(json['elements']) for _, json in self.posts)
+
+    def test_nomenclatures(self):
+        nomes = [Nomenclature(str(i), f'Product {i}') for i in range(1200)]
+        with mock.patch('requests.post', self._fake_post(set())):
+            results = self.sb.bulk_sync_nomenclatures(nomes)
+
+        self.assertTrue(all(isinstance(r, SyncItemResult) and r.ok for r in results))
+        self.assertEqual([r.item for r in results], nomes)
+        self.assertEqual(self._chunks('sync/nomenclature'), [200, 500, 500])
+
+    def test_receipts(self):
+        receipts = [ReceiptConfirm(str(i), 'user', [NomenclatureItem('1', 1, 10)]) for i in range(250)]
+        with mock.patch('requests.post', self._fake_post({'42'})):
+            results = self.sb.bulk_sync_receipts(receipts)
+
+        self.assertEqual([r.item.remote_id for r in results if not r.ok], ['42'])
+        self.assertEqual(self._chunks('sync/receipt')[-3:], [50, 100, 100])
+
+    def test_tags(self):
+        tags = [Tag(str(i), f'Tag {i}') for i in range(501)]
+        with mock.patch('requests.post', self._fake_post({'500'})):
+            results = self.sb.bulk_sync_tags(tags)
+
+        self.assertEqual([r.item.id for r in results if not r.ok], ['500'])
+        self.assertIsInstance(results[500].error, RejectedError)
+        self.assertEqual(self._chunks('sync/tag'), [1, 500])
+
+    def test_raise_error(self):
+        tags = [Tag(str(i), f'Tag {i}') for i in range(10)]
+        with mock.patch('requests.post', self._fake_post(set())):
+            results, ok = self.sb.bulk_sync_tags(tags, raise_error=False)
+        self.assertTrue(ok)
+        self.assertEqual(len(results), 10)
+
+        with mock.patch('requests.post', side_effect=requests.ConnectionError('Connection refused')):
+            error, ok = self.sb.bulk_sync_tags(tags, raise_error=False)
+            self.assertFalse(ok)
+            self.assertIsInstance(error, requests.ConnectionError)
+
+            self.assertRaises(requests.ConnectionError, self.sb.bulk_sync_tags, tags)
+
+
+if __name__ == '__main__':
+    unittest.main()
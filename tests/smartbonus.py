@@ -1,5 +1,5 @@
 from smartbonus import set_root_path, SmartBonus, Client, Nomenclature, ReceiptDiscount, NomenclatureItem, \
-    ReceiptResult, ReceiptConfirm, ReceiptRefund, RefundItem, Tag, StatusBody
+    ReceiptResult, ReceiptConfirm, ReceiptRefund, RefundItem, Tag, StatusBody, SyncItemResult
 from datetime import datetime
 import unittest
 import uuid
@@ -125,6 +125,23 @@ class TestSmartBonus(unittest.TestCase):
 
         self.assertEqual(self.sb.sync_tags(tags), 'Sync success')
 
+    def test_bulk_sync_tags(self):
+        tags = [
+            Tag('1', 'Size', is_group=True),
+            Tag('2', 'M', '1'),
+            Tag('3', 'S', '1'),
+            Tag('5', 'Red', '4'),
+            Tag('4', 'Color', is_group=True),
+            Tag('6', 'Blue', '4'),
+            Tag('7', 'Yellow', '4')
+        ]
+
+        results = self.sb.bulk_sync_tags(tags, workers=2)
+        self.assertEqual(len(results), len(tags))
+        for result in results:
+            self.assertIsInstance(result, SyncItemResult)
+            self.assertTrue(result.ok, str(result.error))
+
     def test_config_order(self):
         order_url, status_url = 'https://domain:port/api/order', 'https://domain:port/api/status'
         resp = self.sb.config_order(order_url, status_url, 'really strong token of your store')